@@ -2,15 +2,25 @@ import streamlit as st
 import re
 import string
 import math
-import time
+import bisect
+import sys
+import threading
 import zxcvbn
+import numpy as np
 import plotly.graph_objects as go
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+try:
+    # Rust port of zxcvbn (PyO3 bindings), much faster on long passwords
+    import zxcvbn_rs_py
+except ImportError:
+    zxcvbn_rs_py = None
 
 # Set page config
 st.set_page_config(page_title="Advanced Password Strength Meter", page_icon="🔒", layout="wide")
 
-# Add custom CSS
+# Add custom CSS. The progress bar color follows the strength label's class
+# via :has(), so no per-rerun style block is needed for it.
 st.markdown("""
 <style>
     .password-very-weak { color: #ff0000; font-weight: bold; }
@@ -21,6 +31,11 @@ st.markdown("""
     .stProgress > div > div > div > div {
         background-color: var(--progress-color, #ff0000);
     }
+    :root:has(.password-very-weak) { --progress-color: #ff0000; }
+    :root:has(.password-weak) { --progress-color: #ff4500; }
+    :root:has(.password-medium) { --progress-color: #ffa500; }
+    :root:has(.password-strong) { --progress-color: #9acd32; }
+    :root:has(.password-very-strong) { --progress-color: #008000; }
     .css-1kyxreq {
         justify-content: center;
     }
@@ -33,44 +48,132 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Character class lookup table: maps every ASCII letter, digit and punctuation
+# character to a representative of its class ('a', 'A', '0', '!') so a password
+# can be classified with a single str.translate pass. The representatives are
+# themselves in the table, so they can only appear in the output as class codes.
+# Characters not in the table (whitespace, non-ASCII) pass through as "other".
+_CHAR_CLASS_MAP = str.maketrans(
+    {**{c: 'a' for c in string.ascii_lowercase},
+     **{c: 'A' for c in string.ascii_uppercase},
+     **{c: '0' for c in string.digits},
+     **{c: '!' for c in string.punctuation}}
+)
+# Number of characters in each class, keyed by the class code above
+_CHAR_CLASS_SIZES = {
+    'a': len(string.ascii_lowercase),
+    'A': len(string.ascii_uppercase),
+    '0': len(string.digits),
+    '!': len(string.punctuation),
+}
+
+# Simple keyboard pattern detection (can be expanded): every 3-character run
+# along a keyboard row, built at module level so a password only needs to be
+# split into its own 3-grams and intersected with this set.
+_KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+_KEYBOARD_TRIGRAMS = frozenset(
+    row[i:i+3] for row in _KEYBOARD_ROWS for i in range(len(row) - 2)
+)
+
+# List of common words/patterns to check for, compiled into one alternation.
+# The lookahead makes matches zero-width so overlapping words (e.g. the
+# "123456" inside "abc123456") are all found in a single scan.
+_COMMON_WORDS = ("password", "123456", "qwerty", "admin", "welcome",
+                 "login", "abc123", "letmein", "monkey", "football")
+_COMMON_WORDS_RE = re.compile(
+    "(?=(" + "|".join(re.escape(word) for word in _COMMON_WORDS) + "))"
+)
+
 # Password Analysis Functions
+def charset_size(password: str) -> int:
+    """Size of the character set spanned by the classes used in the password."""
+    # Calculate character set size from the classes present (single pass)
+    classes = set(password.translate(_CHAR_CLASS_MAP))
+    char_set_size = sum(_CHAR_CLASS_SIZES.get(c, 0) for c in classes)
+    
+    # If we somehow didn't identify any character sets, set a minimum
+    if char_set_size == 0:
+        char_set_size = 10
+    return char_set_size
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def entropy_from_charset(char_set_size: int, length: int) -> float:
+    """Entropy in bits of a password of the given length and character set size."""
+    return math.log2(char_set_size) * length
+
 def analyze_entropy(password: str) -> float:
     """Calculate password entropy in bits."""
     if not password:
         return 0
     
-    # Calculate character set size
-    char_set_size = 0
-    if any(c in string.ascii_lowercase for c in password):
-        char_set_size += 26
-    if any(c in string.ascii_uppercase for c in password):
-        char_set_size += 26
-    if any(c in string.digits for c in password):
-        char_set_size += 10
-    if any(c in string.punctuation for c in password):
-        char_set_size += len(string.punctuation)
-    
-    # If we somehow didn't identify any character sets, set a minimum
-    if char_set_size == 0:
-        char_set_size = 10
-        
-    # Calculate entropy
-    entropy = math.log2(char_set_size) * len(password)
-    return entropy
+    # Entropy only depends on (character set size, length), so cache on that
+    # pair: every password with the same profile shares one entry
+    return entropy_from_charset(charset_size(password), len(password))
 
+@st.cache_data(show_spinner=False, max_entries=256)
 def analyze_character_distribution(password: str) -> Dict[str, int]:
     """Analyze character distribution in password."""
+    classes = password.translate(_CHAR_CLASS_MAP)
     distribution = {
-        'lowercase': sum(1 for c in password if c in string.ascii_lowercase),
-        'uppercase': sum(1 for c in password if c in string.ascii_uppercase),
-        'digits': sum(1 for c in password if c in string.digits),
-        'special': sum(1 for c in password if c in string.punctuation),
-        'other': sum(1 for c in password if c not in string.ascii_letters + string.digits + string.punctuation)
+        'lowercase': classes.count('a'),
+        'uppercase': classes.count('A'),
+        'digits': classes.count('0'),
+        'special': classes.count('!'),
     }
+    distribution['other'] = len(password) - sum(distribution.values())
     return distribution
 
-def find_patterns(password: str) -> Dict[str, int]:
-    """Find common patterns in password."""
+# UTF-32 in native byte order, so the encoded password can be viewed as
+# an array of unsigned ints without copying
+_NATIVE_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+def code_points(password: str) -> Sequence[int]:
+    """Code points of the password as a buffer whose items index as ints."""
+    # ASCII bytes are one byte per character; otherwise UTF-32 keeps one
+    # element per character. Either way item i equals ord(password[i]).
+    if password.isascii():
+        return password.encode('ascii')
+    return memoryview(password.encode(_NATIVE_UTF32)).cast('I')
+
+def run_steps(password: str) -> Iterator[int]:
+    """Lazily yield the code point step of each evenly spaced 3-character run.
+    
+    A step of 1 is a sequential run (e.g. abc), a step of 0 a repeated run
+    (e.g. aaa). Both the counting and the short-circuiting checks use this.
+    """
+    codes = code_points(password)
+    return (b - a for a, b, c in zip(codes, codes[1:], codes[2:]) if b - a == c - b)
+
+def count_char_runs(password: str) -> Tuple[int, int]:
+    """Count sequential (e.g. abc) and repeated (e.g. aaa) 3-character runs."""
+    steps = list(run_steps(password))
+    return steps.count(1), steps.count(0)
+
+def has_sequential_run(password: str) -> bool:
+    """Check for a sequential 3-character run (e.g. abc), stopping at the first."""
+    return 1 in run_steps(password)
+
+def has_repeated_run(password: str) -> bool:
+    """Check for a repeated 3-character run (e.g. aaa), stopping at the first."""
+    return 0 in run_steps(password)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def find_patterns(password: str, counts: bool = False) -> Dict[str, Union[bool, int]]:
+    """Find common patterns in password.
+    
+    By default each entry is a bool and every check stops at its first match;
+    pass counts=True to count all occurrences instead.
+    """
+    lowered = password.lower()
+    if not counts:
+        return {
+            'sequential_chars': has_sequential_run(password),
+            'repeated_chars': has_repeated_run(password),
+            'keyboard_patterns': not _KEYBOARD_TRIGRAMS.isdisjoint(
+                lowered[i:i+3] for i in range(len(lowered) - 2)),
+            'common_words': _COMMON_WORDS_RE.search(lowered) is not None
+        }
+    
     patterns = {
         'sequential_chars': 0,
         'repeated_chars': 0,
@@ -78,38 +181,25 @@ def find_patterns(password: str) -> Dict[str, int]:
         'common_words': 0
     }
     
-    # Check for sequential characters
-    for i in range(len(password) - 2):
-        if (ord(password[i]) + 1 == ord(password[i+1]) and 
-            ord(password[i+1]) + 1 == ord(password[i+2])):
-            patterns['sequential_chars'] += 1
-    
-    # Check for repeated characters
-    for i in range(len(password) - 2):
-        if password[i] == password[i+1] == password[i+2]:
-            patterns['repeated_chars'] += 1
+    # Check for sequential and repeated characters
+    patterns['sequential_chars'], patterns['repeated_chars'] = count_char_runs(password)
     
-    # Simple keyboard pattern detection (can be expanded)
-    keyboard_rows = [
-        "qwertyuiop",
-        "asdfghjkl",
-        "zxcvbnm"
-    ]
-    for row in keyboard_rows:
-        for i in range(len(row) - 2):
-            pattern = row[i:i+3].lower()
-            if pattern in password.lower():
-                patterns['keyboard_patterns'] += 1
+    # Count distinct keyboard 3-grams present in the password
+    trigrams = {lowered[i:i+3] for i in range(len(lowered) - 2)}
+    patterns['keyboard_patterns'] = len(_KEYBOARD_TRIGRAMS.intersection(trigrams))
     
-    # List of common words/patterns to check for
-    common_words = ["password", "123456", "qwerty", "admin", "welcome", 
-                    "login", "abc123", "letmein", "monkey", "football"]
-    for word in common_words:
-        if word in password.lower():
-            patterns['common_words'] += 1
+    # Count distinct common words present in the password
+    patterns['common_words'] = len(set(_COMMON_WORDS_RE.findall(lowered)))
     
     return patterns
 
+# Crack time display units: a duration below _TIME_UNIT_BOUNDS[i] seconds is
+# shown in _TIME_UNITS[i]; anything longer is shown in years
+_TIME_UNIT_BOUNDS = (60, 3600, 86400, 31536000)
+_TIME_UNITS = ((1, "seconds"), (60, "minutes"), (3600, "hours"),
+               (86400, "days"), (31536000, "years"))
+
+@st.cache_data(show_spinner=False, max_entries=4096)
 def calculate_crack_time(entropy: float) -> Tuple[float, str]:
     """Estimate time to crack the password based on entropy."""
     # Assume 10 billion guesses per second (modern password cracker)
@@ -122,29 +212,32 @@ def calculate_crack_time(entropy: float) -> Tuple[float, str]:
     seconds = guesses / guesses_per_second
     
     # Convert to appropriate time unit
-    if seconds < 60:
-        return seconds, "seconds"
-    elif seconds < 3600:
-        return seconds / 60, "minutes"
-    elif seconds < 86400:
-        return seconds / 3600, "hours"
-    elif seconds < 31536000:
-        return seconds / 86400, "days"
-    elif seconds < 31536000 * 100:
-        return seconds / 31536000, "years"
-    else:
-        return seconds / 31536000, "years"
+    divisor, unit = _TIME_UNITS[bisect.bisect_right(_TIME_UNIT_BOUNDS, seconds)]
+    return seconds / divisor, unit
 
-def get_rate_color(score: int) -> str:
-    """Get color based on score."""
-    colors = {
-        0: "#ff0000",  # Very Weak - Red
-        1: "#ff4500",  # Weak - Orange Red
-        2: "#ffa500",  # Medium - Orange
-        3: "#9acd32",  # Strong - Yellow Green
-        4: "#008000"   # Very Strong - Green
+def estimate_strength(password: str) -> Dict:
+    """Run zxcvbn, preferring the Rust implementation when it is installed.
+    
+    Returns a dict with the same 'score' and 'feedback' keys as zxcvbn.zxcvbn.
+    """
+    if zxcvbn_rs_py is None:
+        return zxcvbn.zxcvbn(password)
+    
+    estimate = zxcvbn_rs_py.zxcvbn(password)
+    feedback = estimate.feedback
+    return {
+        'score': int(estimate.score),
+        'guesses': estimate.guesses,
+        'feedback': {
+            'warning': str(feedback.warning) if feedback and feedback.warning else '',
+            'suggestions': [str(s) for s in feedback.suggestions] if feedback else []
+        }
     }
-    return colors.get(score, "#ff0000")
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def zxcvbn_result(password: str) -> Dict:
+    """Run zxcvbn on the password, cached across reruns."""
+    return estimate_strength(password)
 
 def get_rate_label(score: int) -> str:
     """Get label based on score."""
@@ -157,73 +250,74 @@ def get_rate_label(score: int) -> str:
     }
     return labels.get(score, "Very Weak")
 
-def get_suggestions(password: str, char_distribution: Dict[str, int], patterns: Dict[str, int]) -> List[str]:
+# Suggestion rules as (predicate, message) pairs, checked in order. Each
+# predicate takes (password, char_distribution, patterns).
+_SUGGESTION_RULES = (
+    (lambda pw, dist, pat: len(pw) < 12, "Make your password longer (aim for at least 12 characters)"),
+    (lambda pw, dist, pat: dist['lowercase'] == 0, "Add lowercase letters"),
+    (lambda pw, dist, pat: dist['uppercase'] == 0, "Add uppercase letters"),
+    (lambda pw, dist, pat: dist['digits'] == 0, "Add numbers"),
+    (lambda pw, dist, pat: dist['special'] == 0, "Add special characters (e.g., @, #, $, %)"),
+    (lambda pw, dist, pat: pat['sequential_chars'], "Avoid sequential characters (e.g., abc, 123)"),
+    (lambda pw, dist, pat: pat['repeated_chars'], "Avoid repeated characters (e.g., aaa, 111)"),
+    (lambda pw, dist, pat: pat['keyboard_patterns'], "Avoid keyboard patterns (e.g., qwerty, asdf)"),
+    (lambda pw, dist, pat: pat['common_words'], "Avoid common words and patterns"),
+)
+
+def get_suggestions(password: str, char_distribution: Dict[str, int], patterns: Dict[str, bool]) -> List[str]:
     """Get suggestions to improve password strength."""
-    suggestions = []
-    
     if not password:
         return ["Enter a password to get suggestions"]
     
-    if len(password) < 12:
-        suggestions.append("Make your password longer (aim for at least 12 characters)")
-    
-    if char_distribution['lowercase'] == 0:
-        suggestions.append("Add lowercase letters")
-    
-    if char_distribution['uppercase'] == 0:
-        suggestions.append("Add uppercase letters")
-    
-    if char_distribution['digits'] == 0:
-        suggestions.append("Add numbers")
-    
-    if char_distribution['special'] == 0:
-        suggestions.append("Add special characters (e.g., @, #, $, %)")
-    
-    if patterns['sequential_chars'] > 0:
-        suggestions.append("Avoid sequential characters (e.g., abc, 123)")
-    
-    if patterns['repeated_chars'] > 0:
-        suggestions.append("Avoid repeated characters (e.g., aaa, 111)")
-    
-    if patterns['keyboard_patterns'] > 0:
-        suggestions.append("Avoid keyboard patterns (e.g., qwerty, asdf)")
-    
-    if patterns['common_words'] > 0:
-        suggestions.append("Avoid common words and patterns")
-    
-    if len(suggestions) == 0:
-        suggestions.append("Your password looks good! Remember to use different passwords for different accounts.")
+    suggestions = [message for rule, message in _SUGGESTION_RULES
+                   if rule(password, char_distribution, patterns)]
+    return suggestions or ["Your password looks good! Remember to use different passwords for different accounts."]
+
+# Character distribution keys and their chart labels, in pie slice order
+_COMPOSITION_KEYS = ('lowercase', 'uppercase', 'digits', 'special', 'other')
+_COMPOSITION_LABELS = np.array(['Lowercase', 'Uppercase', 'Digits', 'Special', 'Other'])
+
+@st.cache_resource
+def base_composition_chart() -> Tuple[go.Figure, threading.Lock]:
+    """Build the character composition pie chart once; traces are filled per render.
     
-    return suggestions
+    The figure is shared by every session, so it comes with the lock that
+    must be held while filling in its trace and rendering it.
+    """
+    fig = go.Figure(data=[go.Pie(
+        labels=[],
+        values=[],
+        hole=.3,
+        marker_colors=['#4CAF50', '#2196F3', '#FFC107', '#FF5722', '#9C27B0']
+    )])
+    fig.update_layout(
+        title="Character Composition",
+        height=300,
+        margin=dict(l=10, r=10, t=40, b=10)
+    )
+    return fig, threading.Lock()
 
 # Main app
 def main():
     st.title("🔒 Advanced Password Strength Meter")
     
-    # Password input with toggle for visibility
+    # Password input with toggle for visibility. The input sits in a form so
+    # typing doesn't rerun the app; it returns the last submitted password.
     col1, col2 = st.columns([4, 1])
     with col1:
         password_visible = col2.checkbox("Show password", value=False)
-        if password_visible:
-            password = st.text_input("Enter your password:", key="visible_password")
-        else:
-            password = st.text_input("Enter your password:", type="password", key="hidden_password")
-    
-    # Add a small delay for visual effect
-    if password:
-        progress_bar = st.progress(0)
-        for i in range(1, 101):
-            # Faster progress to make the app feel responsive
-            progress_bar.progress(i/100)
-            time.sleep(0.005)
-        
-        # Clear the progress bar after completion
-        st.empty()
+        with st.form("password_form", clear_on_submit=False):
+            if password_visible:
+                password = st.text_input("Enter your password:", key="visible_password")
+            else:
+                password = st.text_input("Enter your password:", type="password", key="hidden_password")
+            st.form_submit_button("Analyze")
     
     # Analyze password if provided
     if password:
         # Get zxcvbn score and other metrics
-        result = zxcvbn.zxcvbn(password)
+        with st.spinner("Analyzing..."):
+            result = zxcvbn_result(password)
         score = result['score']  # 0-4 score
         
         # Custom metrics
@@ -233,7 +327,6 @@ def main():
         crack_time_value, crack_time_unit = calculate_crack_time(entropy)
         
         # Prepare feedback
-        color = get_rate_color(score)
         label = get_rate_label(score)
         
         # Create columns for layout
@@ -243,14 +336,7 @@ def main():
             # Display overall strength with colored label
             st.markdown(f"### Password Strength: <span class='password-{label.lower().replace(' ', '-')}'>{label}</span>", unsafe_allow_html=True)
             
-            # Display progress bar with color
-            st.markdown(f"""
-                <style>
-                    :root {{
-                        --progress-color: {color};
-                    }}
-                </style>
-            """, unsafe_allow_html=True)
+            # Display progress bar (colored by the label's CSS class)
             st.progress((score + 1) / 5)
             
             # Estimated crack time
@@ -268,45 +354,39 @@ def main():
         
         with col2:
             # Password composition chart
-            labels = ['Lowercase', 'Uppercase', 'Digits', 'Special', 'Other']
-            values = [
-                char_distribution['lowercase'],
-                char_distribution['uppercase'],
-                char_distribution['digits'],
-                char_distribution['special'],
-                char_distribution['other']
-            ]
+            values = np.fromiter(
+                (char_distribution[key] for key in _COMPOSITION_KEYS),
+                dtype=np.int32, count=len(_COMPOSITION_KEYS)
+            )
             
             # Filter out zero values
-            non_zero_labels = [label for label, value in zip(labels, values) if value > 0]
-            non_zero_values = [value for value in values if value > 0]
+            non_zero = values > 0
             
-            if sum(values) > 0:  # Only show chart if we have characters
-                fig = go.Figure(data=[go.Pie(
-                    labels=non_zero_labels,
-                    values=non_zero_values,
-                    hole=.3,
-                    marker_colors=['#4CAF50', '#2196F3', '#FFC107', '#FF5722', '#9C27B0']
-                )])
-                fig.update_layout(
-                    title="Character Composition",
-                    height=300,
-                    margin=dict(l=10, r=10, t=40, b=10)
-                )
-                st.plotly_chart(fig, use_container_width=True)
+            if non_zero.any():  # Only show chart if we have characters
+                fig, fig_lock = base_composition_chart()
+                with fig_lock:
+                    fig.data[0].labels = _COMPOSITION_LABELS[non_zero]
+                    fig.data[0].values = values[non_zero]
+                    st.plotly_chart(fig, use_container_width=True)
             
             # Show detailed metrics
             st.markdown("### Password Details:")
             st.markdown(f"*Length:* {len(password)} characters")
             st.markdown(f"*Entropy:* {entropy:.2f} bits")
             
-            # Check for patterns
-            pattern_count = sum(patterns.values())
-            if pattern_count > 0:
-                st.markdown(f"*Patterns detected:* {pattern_count}")
-                for pattern_type, count in patterns.items():
-                    if count > 0:
-                        st.markdown(f"- {pattern_type.replace('_', ' ').title()}: {count}")
+            # Check for patterns (counting every occurrence only on request)
+            if any(patterns.values()):
+                if st.checkbox("Show detailed pattern counts", value=False, key="pattern_counts"):
+                    pattern_counts = find_patterns(password, counts=True)
+                    st.markdown(f"*Patterns detected:* {sum(pattern_counts.values())}")
+                    for pattern_type, count in pattern_counts.items():
+                        if count > 0:
+                            st.markdown(f"- {pattern_type.replace('_', ' ').title()}: {count}")
+                else:
+                    st.markdown("*Patterns detected:*")
+                    for pattern_type, found in patterns.items():
+                        if found:
+                            st.markdown(f"- {pattern_type.replace('_', ' ').title()}")
     
     # Information about the app
     with st.expander("About this Password Strength Meter"):